@@ -1,28 +1,405 @@
 import asyncio
 import logging
-from typing import Optional
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from types import MappingProxyType
+from typing import AsyncIterator, Callable, List, Optional, Union
+import httpx
 from openai import AsyncOpenAI
 from pydantic_ai import Agent
+from pydantic_ai.exceptions import ModelHTTPError
 from pydantic_ai.models.openai import OpenAIChatModel
 from pydantic_ai.providers.openai import OpenAIProvider
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import uvloop  # Optional: faster event loop
+except ImportError:
+    uvloop = None
+
+try:
+    import h2  # Optional: HTTP/2 support for httpx
+except ImportError:
+    h2 = None
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_SYSTEM_PROMPT = "You are a helpful assistant."
+
+# Query string sent on every LLM Farm request (shared, read-only)
+FARM_API_QUERY = MappingProxyType({"api-version": "2024-08-01-preview"})
+
+# Default read timeout for completions. Keep it long: the SDK retries timeouts,
+# so a slow non-streaming completion would otherwise be generated (and billed)
+# once per attempt before failing anyway
+DEFAULT_READ_TIMEOUT = 600.0
+
+
+class RateLimiter:
+    """Token bucket limiting request starts to a requests-per-minute budget"""
+    
+    def __init__(self, requests_per_minute: int, burst: int = 1):
+        self.rate = requests_per_minute / 60.0  # Tokens refilled per second
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        # The bucket is shared by every loop/thread using the agent; the lock
+        # only guards the balance update (there is no await inside it)
+        self._lock = threading.Lock()
+    
+    async def acquire(self) -> None:
+        """Take a token, waiting for the bucket to refill if it is empty"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            # Reserve the token up front (the balance may go negative) so waiting
+            # callers are queued in arrival order without holding the lock
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if delay:
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                with self._lock:
+                    self._tokens += 1  # Give the reservation back to later callers
+                raise
+
+
+class ResponseCache:
+    """In-memory exact-match LRU response cache with per-entry expiry"""
+    
+    def __init__(self, ttl: float, maxsize: int = 1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+    
+    def get(self, key) -> Optional[str]:
+        """Return the cached response, or None if missing/expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key, value: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+def _log_error(label: str, e: Exception) -> None:
+    """Log a failed request, including HTTP details from the farm if present"""
+    if isinstance(e, ModelHTTPError):
+        logger.error(
+            "✗ %s: HTTP %s from %s: %s", label, e.status_code, e.model_name, e.body
+        )
+    else:
+        logger.error("✗ %s: %s: %s", label, type(e).__name__, e)
+
+
+_registry_lock = threading.Lock()
+
+
+def _for_loop(
+    registry: weakref.WeakKeyDictionary,
+    loop: asyncio.AbstractEventLoop,
+    factory: Callable,
+    on_drop: Optional[Callable] = None
+):
+    """Return registry[loop], creating it with factory() on first use"""
+    with _registry_lock:
+        value = registry.get(loop)
+        if value is None:
+            # Values may reference their loop, so entries of closed loops are
+            # dropped here rather than left for the (weak-keyed) GC
+            for stale in [l for l in registry if l.is_closed()]:
+                dropped = registry.pop(stale)
+                if on_drop:
+                    on_drop(dropped)
+            value = registry[loop] = factory()
+        return value
+
+
+def _cached(cache: OrderedDict, key, factory: Callable):
+    """Return cache[key] from a small LRU cache, creating it with factory() on a miss"""
+    value = cache.get(key)
+    if value is None:
+        value = cache[key] = factory()
+        if len(cache) > 32:
+            cache.popitem(last=False)
+    else:
+        cache.move_to_end(key)
+    return value
+
+
+# Event loop reused by all sync wrappers so the HTTP connection pool stays warm.
+# It runs in its own daemon thread, so sync calls from any thread are safe.
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_thread: Optional[threading.Thread] = None
+_sync_lock = threading.Lock()
+
+
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """Create an event loop, using uvloop when it is installed"""
+    return uvloop.new_event_loop() if uvloop else asyncio.new_event_loop()
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    """Return the sync wrappers' event loop, starting its thread on first use"""
+    global _sync_loop, _sync_thread
+    with _sync_lock:
+        if _sync_loop is None or _sync_loop.is_closed():
+            _sync_loop = _new_event_loop()
+            _sync_thread = threading.Thread(
+                target=_sync_loop.run_forever, name="llmfarm-sync-loop", daemon=True
+            )
+            _sync_thread.start()
+        return _sync_loop
+
+
+def _run_sync(coro):
+    """Run a coroutine to completion on the shared sync event loop"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        raise RuntimeError(
+            "Sync wrappers cannot be called from a running event loop; "
+            "await the async method instead"
+        )
+    
+    future = asyncio.run_coroutine_threadsafe(coro, _get_sync_loop())
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()  # e.g. KeyboardInterrupt: don't leave the request running
+        raise
+
+
+# HTTP/2 multiplexes concurrent requests over one connection; it needs the
+# optional h2 package (httpx negotiates via ALPN, falling back to HTTP/1.1)
+HTTP2_ENABLED = h2 is not None
+
+
+def _farm_timeout(read_timeout: float) -> httpx.Timeout:
+    """Staged timeouts: fail fast on connect/pool waits, allow long completions"""
+    return httpx.Timeout(connect=5.0, read=read_timeout, write=10.0, pool=10.0)
+
+
+def _new_http_client() -> httpx.AsyncClient:
+    """Create an HTTP client with a connection pool tuned for the LLM Farm"""
+    return httpx.AsyncClient(
+        http2=HTTP2_ENABLED,
+        timeout=_farm_timeout(DEFAULT_READ_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=50,
+            keepalive_expiry=30
+        )
+    )
+
+
+class _LoopState:
+    """HTTP pool of one event loop, plus the clients and agents built on it"""
+    
+    def __init__(self):
+        self.http_client = _new_http_client()
+        self.clients: OrderedDict = OrderedDict()
+        self.agents: OrderedDict = OrderedDict()
+
+
+# HTTP client shared by every agent so keep-alive connections are reused. httpx
+# pools bind to the loop that first uses them, so each event loop gets its own
+# (and so do the AsyncOpenAI clients and agents built on top of it)
+_loop_states: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _warn_dropped(state: _LoopState) -> None:
+    """Report a pool dropped with its closed loop (it can't be closed any more)"""
+    if not state.http_client.is_closed:
+        logger.warning(
+            "Dropped HTTP pool of a closed event loop without closing it; "
+            "await aclose() before the loop ends"
+        )
+
+
+def _loop_state(loop: asyncio.AbstractEventLoop) -> _LoopState:
+    """Return the pool/client/agent state of an event loop, creating it on first use"""
+    return _for_loop(_loop_states, loop, _LoopState, on_drop=_warn_dropped)
+
+
+def _get_http_client(loop: asyncio.AbstractEventLoop) -> httpx.AsyncClient:
+    """Return the shared HTTP client of an event loop, creating it on first use"""
+    return _loop_state(loop).http_client
+
+
+def _require_running_loop(name: str) -> asyncio.AbstractEventLoop:
+    """Return the running event loop, for objects that are bound to it"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        raise RuntimeError(
+            f"{name} is bound to the event loop that uses it; "
+            "read it inside that loop (in async code)"
+        ) from None
+
+
+def _build_client(
+    loop: asyncio.AbstractEventLoop,
+    api_key: str,
+    base_url: str,
+    max_retries: int,
+    read_timeout: float
+) -> AsyncOpenAI:
+    """Build (and cache) the AsyncOpenAI client for an LLM Farm endpoint on a loop"""
+    state = _loop_state(loop)
+    
+    def create() -> AsyncOpenAI:
+        # The SDK retries 408/409/429/5xx and connection errors with exponential
+        # backoff + jitter, honoring Retry-After headers from the gateway
+        return AsyncOpenAI(
+            base_url=base_url,
+            api_key="dummy",  # LLM Farm doesn't use standard API key
+            default_headers={"genaiplatform-farm-subscription-key": api_key},
+            default_query=FARM_API_QUERY,
+            http_client=state.http_client,
+            timeout=_farm_timeout(read_timeout),  # The SDK applies its own timeout per request
+            max_retries=max_retries
+        )
+    
+    return _cached(state.clients, (api_key, base_url, max_retries, read_timeout), create)
+
+
+def _build_agent(
+    loop: asyncio.AbstractEventLoop,
+    api_key: str,
+    model: str,
+    system_prompt: str,
+    base_url: str,
+    max_retries: int,
+    read_timeout: float
+) -> Agent:
+    """Build (and cache) the Pydantic AI agent for a model + system prompt on a loop"""
+    def create() -> Agent:
+        model_instance = OpenAIChatModel(
+            model_name=model,
+            provider=OpenAIProvider(
+                openai_client=_build_client(loop, api_key, base_url, max_retries, read_timeout)
+            )
+        )
+        return Agent(model=model_instance, system_prompt=system_prompt)
+    
+    # Callers strip the system prompt so equivalent prompts share one agent and
+    # send a byte-identical prefix (eligible for provider-side prompt caching)
+    key = (api_key, model, system_prompt, base_url, max_retries, read_timeout)
+    return _cached(_loop_state(loop).agents, key, create)
+
+
+def _reset_after_fork() -> None:
+    """Drop the HTTP pool, clients and event loop inherited from the parent"""
+    global _loop_states, _sync_loop, _sync_thread, _sync_lock, _registry_lock
+    _loop_states = weakref.WeakKeyDictionary()
+    _sync_loop = None
+    _sync_thread = None  # Threads don't survive fork; locks may be held by them
+    _sync_lock = threading.Lock()
+    _registry_lock = threading.Lock()
+
+
+# A forked child (e.g. gunicorn --preload, multiprocessing "fork") must not
+# share the parent's sockets or event loop; it rebuilds them on first use
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+async def aclose() -> None:
+    """
+    Close the running loop's HTTP pool and drop the cached clients and agents
+    
+    Async applications should await this before their loop ends (e.g. at the
+    end of the coroutine passed to asyncio.run()); a pool can't be closed
+    once its loop is.
+    """
+    with _registry_lock:
+        state = _loop_states.pop(asyncio.get_running_loop(), None)
+    if state is not None and not state.http_client.is_closed:
+        await state.http_client.aclose()
+        logger.info("✓ Closed shared HTTP client")
+
+
+def close() -> None:
+    """
+    Synchronous aclose() for every event loop, then stop the sync event loop
+    
+    Pools of loops still running elsewhere must be closed with aclose() on
+    that loop, and pools of already closed loops can only be dropped; both
+    are logged.
+    """
+    global _sync_loop, _sync_thread
+    with _sync_lock:
+        loop, _sync_loop = _sync_loop, None
+        thread, _sync_thread = _sync_thread, None
+    if loop is not None and not loop.is_closed():
+        try:
+            asyncio.run_coroutine_threadsafe(aclose(), loop).result()
+            asyncio.run_coroutine_threadsafe(loop.shutdown_asyncgens(), loop).result()
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+    
+    with _registry_lock:
+        remaining = list(_loop_states.items())
+    for loop, state in remaining:
+        if state.http_client.is_closed:
+            continue
+        if loop.is_running():
+            logger.warning(
+                "HTTP pool of a running event loop left open; await aclose() on that loop"
+            )
+        elif loop.is_closed():
+            with _registry_lock:
+                _loop_states.pop(loop, None)
+            _warn_dropped(state)
+        else:
+            loop.run_until_complete(aclose())
+
 
 class LLMFarmAgent:
-    """Pydantic AI Agent wrapper for LLM Farm"""
+    """
+    Pydantic AI Agent wrapper for LLM Farm
+    
+    Keep system prompts static and pass per-request data as `context`: it is
+    sent as a separate system message after the system prompt, so the shared
+    prefix stays byte-identical and eligible for provider prompt caching.
+    """
     
     def __init__(
         self, 
         api_key: str, 
         model: str = "gpt-4o-mini",
-        system_prompt: str = "You are a helpful assistant.",
-        base_url: str = "https://aoai-farm.bosch-temp.com/api/openai/deployments/askbosch-prod-farm-openai-gpt-4o-mini-2024-07-18/"
+        system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+        base_url: str = "https://aoai-farm.bosch-temp.com/api/openai/deployments/askbosch-prod-farm-openai-gpt-4o-mini-2024-07-18/",
+        max_concurrency: int = 8,
+        requests_per_minute: Optional[int] = None,
+        rate_limit_burst: int = 1,
+        cache_ttl: Optional[float] = None,
+        max_retries: int = 2,
+        read_timeout: float = DEFAULT_READ_TIMEOUT
     ):
         """
         Initialize LLM Farm Agent with Pydantic AI
@@ -32,80 +409,240 @@ class LLMFarmAgent:
             model: Model name (not added to URL, just for reference)
             system_prompt: Default system prompt for the agent
             base_url: LLM Farm endpoint URL (must end with /)
+            max_concurrency: Max number of requests in flight at once, per event
+                loop (the sync wrappers' loop and each application loop
+                count separately); requests_per_minute is shared by all
+            requests_per_minute: Optional request rate limit (None = unlimited)
+            rate_limit_burst: Requests allowed back-to-back before RPM pacing
+            cache_ttl: Seconds to cache identical prompts (None = no caching)
+            max_retries: Retries for transient errors (429, 5xx, timeouts)
+            read_timeout: Seconds to wait for response data (per retry attempt)
         """
-        logger.info(f"Initializing LLM Farm Agent with model: {model}")
+        logger.info("Initializing LLM Farm Agent with model: %s", model)
         
-        # Configure AsyncOpenAI client for LLM Farm
-        self.client = AsyncOpenAI(
-            base_url=base_url,
-            api_key="dummy",  # LLM Farm doesn't use standard API key
-            default_headers={"genaiplatform-farm-subscription-key": api_key},
-            default_query={"api-version": "2024-08-01-preview"}
+        self._api_key = api_key
+        self.model = model
+        self.system_prompt = system_prompt.strip()
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.read_timeout = read_timeout
+        self.max_concurrency = max_concurrency
+        
+        # Throttle requests to avoid 429s from the LLM Farm gateway. asyncio
+        # primitives bind to one loop, so each event loop gets its own semaphore
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._rate_limiter = (
+            RateLimiter(requests_per_minute, rate_limit_burst) if requests_per_minute else None
         )
+        self._cache = ResponseCache(cache_ttl) if cache_ttl else None
+        logger.info("✓ LLM Farm Agent initialized successfully")
+    
+    @property
+    def client(self) -> AsyncOpenAI:
+        """
+        AsyncOpenAI client for the running event loop (shared by same-config agents)
         
-        # Create Pydantic AI model and agent
-        model_instance = OpenAIChatModel(
-            model_name=model,
-            provider=OpenAIProvider(openai_client=self.client)
+        Read it inside the loop that will use it; reading it outside a running
+        loop raises RuntimeError.
+        """
+        return _build_client(
+            _require_running_loop("LLMFarmAgent.client"),
+            self._api_key,
+            self.base_url,
+            self.max_retries,
+            self.read_timeout
         )
+    
+    @property
+    def agent(self) -> Agent:
+        """
+        Pydantic AI agent for the default system prompt on the running event loop
         
-        self.agent = Agent(model=model_instance, system_prompt=system_prompt)
-        logger.info("✓ LLM Farm Agent initialized successfully")
+        Read it inside the loop that will use it; reading it outside a running
+        loop raises RuntimeError.
+        """
+        _require_running_loop("LLMFarmAgent.agent")
+        return self._agent_for(None)
+    
+    @asynccontextmanager
+    async def _throttle(self):
+        """Hold a concurrency slot (and rate limit token) for one request"""
+        semaphore = _for_loop(
+            self._semaphores,
+            asyncio.get_running_loop(),
+            lambda: asyncio.Semaphore(self.max_concurrency)
+        )
+        async with semaphore:
+            if self._rate_limiter:
+                await self._rate_limiter.acquire()
+            yield
+    
+    async def warmup(self, connections: int = 1) -> None:
+        """
+        Open connections to the LLM Farm ahead of the first real requests
+        
+        Any HTTP response (even an error status) leaves a warm TLS connection
+        in the shared pool, so only transport errors are reported.
+        
+        Args:
+            connections: Parallel connections to open (match expected concurrency).
+                With HTTP/2 (h2 installed, https endpoint) one multiplexed
+                connection serves all concurrent requests, so only one is opened.
+        """
+        # httpx sends parallel HTTP/2-capable requests over the one pending
+        # connection anyway, so extra HEADs would not open more connections
+        if HTTP2_ENABLED and httpx.URL(self.base_url).scheme == "https":
+            connections = 1
+        
+        client = _get_http_client(asyncio.get_running_loop())
+        results = await asyncio.gather(
+            *(client.head(self.base_url) for _ in range(connections)),
+            return_exceptions=True
+        )
+        errors = [r for r in results if isinstance(r, Exception)]
+        if errors:
+            logger.warning(
+                "Warmup failed for %d/%d connection(s): %s: %s",
+                len(errors), connections, type(errors[0]).__name__, errors[0]
+            )
+        responses = [r for r in results if not isinstance(r, Exception)]
+        if responses:
+            logger.info(
+                "✓ %d connection(s) to LLM Farm warmed up (%s)",
+                len(responses), responses[0].http_version
+            )
+    
+    def _agent_for(self, system_prompt: Optional[str]) -> Agent:
+        """Agent to use for a request, honoring a system prompt override"""
+        return _build_agent(
+            asyncio.get_running_loop(),
+            self._api_key,
+            self.model,
+            system_prompt.strip() if system_prompt else self.system_prompt,
+            self.base_url,
+            self.max_retries,
+            self.read_timeout
+        )
     
-    async def run(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+    async def run(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> str:
         """
         Run the agent with a prompt
         
         Args:
             prompt: User prompt/query
             system_prompt: Override system prompt for this specific request
+            context: Per-request dynamic content (e.g. retrieved documents), sent
+                after the static system prompt so that prefix stays cacheable
             
         Returns:
             Agent response as string
         """
-        logger.info(f"Running agent: {prompt[:60]}...")
+        logger.info("Running agent: %.60s...", prompt)
+        
+        # Key on the prompt actually sent, so an override equal to the default
+        # (or differing only in surrounding whitespace) shares the entry
+        effective_prompt = system_prompt.strip() if system_prompt else self.system_prompt
+        cache_key = (effective_prompt, context, prompt)
+        if self._cache:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                logger.info("✓ Cache hit")
+                return cached
         
         try:
-            # Update system prompt if provided
-            if system_prompt:
-                self.agent._system_prompt = system_prompt
+            agent = self._agent_for(system_prompt)
+            async with self._throttle():
+                result = await agent.run(prompt, instructions=context)
+            output = result.output  # Agent output type is str
+            logger.info("✓ Completed (%d chars)", len(output))
             
-            result = await self.agent.run(prompt)
-            output = str(result.output)
-            logger.info(f"✓ Completed ({len(output)} chars)")
+            if self._cache:
+                self._cache.set(cache_key, output)
             return output
             
         except Exception as e:
-            logger.error(f"✗ Error: {type(e).__name__}: {str(e)}")
+            _log_error("Error", e)
             raise
     
-    async def run_stream(self, prompt: str, system_prompt: Optional[str] = None):
+    async def run_many(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> List[Union[str, Exception]]:
+        """
+        Run the agent on many prompts concurrently
+        
+        Requests are still bounded by max_concurrency (per event loop) and
+        requests_per_minute.
+        
+        Args:
+            prompts: User prompts/queries
+            system_prompt: Override system prompt for these requests
+            context: Per-request dynamic content (e.g. retrieved documents), sent
+                after the static system prompt so that prefix stays cacheable
+            
+        Returns:
+            Responses in prompt order (the exception for a failed prompt)
+        """
+        return await asyncio.gather(
+            *(self.run(prompt, system_prompt, context) for prompt in prompts),
+            return_exceptions=True
+        )
+    
+    async def run_stream(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> AsyncIterator[str]:
         """
         Run the agent with streaming response
         
         Args:
             prompt: User prompt/query
             system_prompt: Override system prompt for this specific request
+            context: Per-request dynamic content (e.g. retrieved documents), sent
+                after the static system prompt so that prefix stays cacheable
             
         Yields:
-            Response chunks as they arrive
+            Response text deltas as they arrive
         """
-        logger.info(f"Running agent (streaming): {prompt[:60]}...")
+        logger.info("Running agent (streaming): %.60s...", prompt)
         
         try:
-            if system_prompt:
-                self.agent._system_prompt = system_prompt
-            
-            async for chunk in self.agent.run_stream(prompt):
-                yield chunk
+            agent = self._agent_for(system_prompt)
+            async with self._throttle():
+                async with agent.run_stream(prompt, instructions=context) as result:
+                    async for chunk in result.stream_text(delta=True):
+                        yield chunk
                 
         except Exception as e:
-            logger.error(f"✗ Stream error: {type(e).__name__}: {str(e)}")
+            _log_error("Stream error", e)
             raise
     
-    def run_sync(self, prompt: str, system_prompt: Optional[str] = None) -> str:
-        """Synchronous wrapper for run"""
-        return asyncio.run(self.run(prompt, system_prompt))
+    def run_sync(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> str:
+        """Synchronous wrapper for run (reuses one event loop across calls and threads)"""
+        return _run_sync(self.run(prompt, system_prompt, context))
+    
+    def run_many_sync(
+        self,
+        prompts: List[str],
+        system_prompt: Optional[str] = None,
+        context: Optional[str] = None
+    ) -> List[Union[str, Exception]]:
+        """Synchronous wrapper for run_many (one event loop for the whole batch)"""
+        return _run_sync(self.run_many(prompts, system_prompt, context))
 
 
 async def main():
@@ -117,6 +654,7 @@ async def main():
     
     # Initialize agent
     agent = LLMFarmAgent(api_key=API_KEY)
+    await agent.warmup()
     
     # Test prompts
     prompts = [
@@ -125,15 +663,15 @@ async def main():
         "Tell me a short joke"
     ]
     
-    # Example 1: Regular run
+    # Example 1: Regular run (prompts are sent concurrently)
     print("\n--- Regular Responses ---")
-    for prompt in prompts:
-        try:
-            result = await agent.run(prompt)
-            print(f"\nQ: {prompt}")
-            print(f"A: {result}")
-        except Exception as e:
-            logger.error(f"Failed: {e}")
+    results = await agent.run_many(prompts)
+    for prompt, result in zip(prompts, results):
+        if isinstance(result, Exception):
+            logger.error("Failed: %s", result)
+            continue
+        print(f"\nQ: {prompt}")
+        print(f"A: {result}")
     
     # Example 2: Streaming response
     print("\n\n--- Streaming Response ---")
@@ -141,12 +679,19 @@ async def main():
     print("A: ", end="", flush=True)
     try:
         async for chunk in agent.run_stream("Tell me a fun fact about AI"):
-            if isinstance(chunk, str):
-                print(chunk, end="", flush=True)
+            print(chunk, end="", flush=True)
         print("\n")
     except Exception as e:
-        logger.error(f"Failed: {e}")
+        logger.error("Failed: %s", e)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # Configure logging; set DEBUG=1 for verbose troubleshooting output
+    logging.basicConfig(
+        level=logging.DEBUG if os.getenv("DEBUG") else logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    try:
+        _run_sync(main())
+    finally:
+        close()